@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from tracker.predictions import refresh_all_predictions
+
+
+class Command(BaseCommand):
+    help = 'Recompute daily predictions for users whose stored row is out of date. Schedule it to run just after midnight.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=None, help='Number of worker processes (defaults to CPU count).')
+        parser.add_argument('--chunk-size', type=int, default=100, help='Number of users handled per worker task.')
+
+    def handle(self, *args, **options):
+        for option in ['processes', 'chunk_size']:
+            if options[option] is not None and options[option] < 1:
+                raise CommandError(f'--{option.replace("_", "-")} must be at least 1.')
+
+        refreshed = refresh_all_predictions(processes=options['processes'], chunk_size=options['chunk_size'])
+        self.stdout.write(f'Refreshed predictions for {refreshed} users.')
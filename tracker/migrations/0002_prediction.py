@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-19 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='period',
+            name='ovulation_day',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='Prediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('computed_for', models.DateField()),
+                ('avg_length', models.IntegerField()),
+                ('avg_ovulation', models.IntegerField()),
+                ('day', models.IntegerField()),
+                ('next_period', models.DateField()),
+                ('days_to_next', models.IntegerField()),
+                ('next_ovulation', models.DateField(null=True)),
+                ('days_to_ovul', models.IntegerField(null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -12,4 +12,18 @@ class Period(models.Model):
             ]
 
     def __str__(self):
-        return str(self.first_day)
\ No newline at end of file
+        return str(self.first_day)
+
+class Prediction(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    computed_for = models.DateField()
+    avg_length = models.IntegerField()
+    avg_ovulation = models.IntegerField()
+    day = models.IntegerField()
+    next_period = models.DateField()
+    days_to_next = models.IntegerField()
+    next_ovulation = models.DateField(null=True)
+    days_to_ovul = models.IntegerField(null=True)
+
+    def __str__(self):
+        return f'{self.user} {self.computed_for}'
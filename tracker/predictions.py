@@ -0,0 +1,144 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.db import connections
+from django.db.models import Subquery, OuterRef, Avg, F, ExpressionWrapper, IntegerField, DateField, When, Case, Value, Count
+from django.db.models.functions import Round
+from django.utils import timezone
+from django.contrib.auth.models import User
+from tracker.models import Period, Prediction
+from datetime import timedelta
+
+
+def calculate_statistics(user_id, today):
+    if Period.objects.filter(user_id=user_id).count() < 2:
+        return None
+
+    today = Value(today, output_field=DateField())
+
+    previous_period = Subquery(
+        Period.objects.filter(user=OuterRef('user'), first_day__lt=OuterRef('first_day'))
+        .order_by('-first_day')
+        .values('first_day')[:1])
+
+    averages = (Period.objects.filter(user_id=user_id)
+            .order_by('first_day')
+            .annotate(length=ExpressionWrapper(
+                (F('first_day') - previous_period)/timedelta(days=1),
+                output_field=IntegerField()
+            ))
+            .annotate(ovul_length=Case(
+                    When(ovulation_day__isnull=True, then=Value(14)),
+                    default=ExpressionWrapper(
+                        ((F('ovulation_day')-F('first_day'))/timedelta(days=1))+1,
+                        output_field=IntegerField())
+            ))
+            .aggregate(avg_length=Round(Avg(F'length')), avg_ovulation=Round(Avg(F'ovul_length')))
+        )
+
+    if averages['avg_length'] is None or averages['avg_ovulation'] is None:
+        return None
+
+    predictions = (Period.objects.filter(user_id=user_id)
+                   .order_by('-first_day')
+                   .annotate(day=ExpressionWrapper(
+                       (today-F('first_day'))/timedelta(days=1)+1,
+                       output_field=IntegerField()
+                   ))
+                   .annotate(next_period=ExpressionWrapper(
+                        F('first_day') + timedelta(days=averages['avg_length']),
+                        output_field=DateField()
+                    ))
+                    .annotate(days_to_next=ExpressionWrapper(
+                        (F('next_period')-today)/timedelta(days=1),
+                        output_field=IntegerField()
+                    ))
+                    .annotate(next_ovulation=Case(
+                        When(ovulation_day__isnull = False, then=None),
+                        default=ExpressionWrapper(
+                            F('first_day') + timedelta(days=averages['avg_ovulation']),
+                            output_field=DateField())
+                    ))
+                    .annotate(days_to_ovul_raw=ExpressionWrapper(
+                            (F('next_ovulation')-today)/timedelta(days=1),
+                            output_field=IntegerField()
+                            ),
+                            days_to_ovul=Case(
+                                When(days_to_ovul_raw__lt=0, then=Value(None)),
+                                default=F('days_to_ovul_raw'),
+                                output_field=IntegerField()
+                    ))
+                   .values('day', 'next_period', 'days_to_next', 'next_ovulation', 'days_to_ovul')
+                   .first()
+    )
+
+    return {
+        'averages': averages,
+        'predictions': predictions
+    }
+
+
+def save_prediction(user_id, today, result):
+    if result is None:
+        Prediction.objects.filter(user_id=user_id).delete()
+        return None
+
+    prediction, _ = Prediction.objects.update_or_create(
+        user_id=user_id,
+        defaults={'computed_for': today, **result['averages'], **result['predictions']})
+
+    return prediction
+
+
+def refresh_prediction(user_id, today=None):
+    today = today or timezone.localdate()
+
+    return save_prediction(user_id, today, calculate_statistics(user_id, today))
+
+
+def calculate_chunk(user_ids, today):
+    return [(user_id, calculate_statistics(user_id, today)) for user_id in user_ids]
+
+
+def stale_user_ids(today, user_ids=None):
+    users = User.objects.all() if user_ids is None else User.objects.filter(id__in=user_ids)
+
+    return list(users.annotate(periods=Count('period'))
+                .filter(periods__gte=2)
+                .exclude(prediction__computed_for=today)
+                .order_by('id')
+                .values_list('id', flat=True))
+
+
+def _close_connections():
+    # Forked workers must not share the parent's database connection.
+    connections.close_all()
+
+
+def refresh_all_predictions(today=None, processes=None, chunk_size=100):
+    today = today or timezone.localdate()
+    user_ids = stale_user_ids(today)
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+
+    if not chunks:
+        return 0
+
+    if processes == 1:
+        save_chunks((calculate_chunk(chunk, today) for chunk in chunks), today)
+    else:
+        # Workers only read; rows are written here so writers never contend for the database.
+        # Fork so workers inherit the configured Django app registry instead of re-importing it.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes, initializer=_close_connections,
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            save_chunks(executor.map(calculate_chunk, chunks, [today] * len(chunks)), today)
+
+    return len(user_ids)
+
+
+def save_chunks(results, today):
+    for chunk in results:
+        # Skip users refreshed by a Period write since their chunk was computed.
+        still_stale = set(stale_user_ids(today, [user_id for user_id, _ in chunk]))
+        for user_id, result in chunk:
+            if user_id in still_stale:
+                save_prediction(user_id, today, result)
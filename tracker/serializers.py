@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from tracker.models import Period
+from tracker.models import Period, Prediction
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -34,4 +34,15 @@ class PeriodSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError
         
         return data
-    
\ No newline at end of file
+
+class PredictionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Prediction
+        fields = ['avg_length', 'avg_ovulation', 'day', 'next_period', 'days_to_next', 'next_ovulation', 'days_to_ovul']
+
+    def to_representation(self, instance):
+        data = super(PredictionSerializer, self).to_representation(instance)
+        return {
+            'averages': {field: data[field] for field in ['avg_length', 'avg_ovulation']},
+            'predictions': {field: data[field] for field in ['day', 'next_period', 'days_to_next', 'next_ovulation', 'days_to_ovul']}
+        }
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tracker.models import Period
+from tracker.predictions import refresh_prediction
+
+
+@receiver([post_save, post_delete], sender=Period)
+def refresh_user_prediction(sender, instance, **kwargs):
+    refresh_prediction(instance.user_id)
@@ -1,10 +1,15 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
+from django.db import connection
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
 from datetime import date
-from tracker.models import Period
+from tracker.models import Period, Prediction
+from django.core.management import call_command, CommandError
+from io import StringIO
+from unittest import mock
+from tracker import predictions
 from freezegun import freeze_time
 
 
@@ -210,4 +215,109 @@ class StatisticTestCase(TestCase):
         url = reverse('statistic')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.json(), {'message': 'Add more data to perform calculations.'})
\ No newline at end of file
+        self.assertEqual(response.json(), {'message': 'Add more data to perform calculations.'})
+
+@freeze_time("2024-10-08")
+class PredictionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.otheruser = User.objects.create_user(username='otheruser', password='otherpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def test_period_write_refreshes_prediction(self):
+        Period.objects.create(first_day = '2024-08-02', user=self.user)
+        self.assertFalse(Prediction.objects.filter(user=self.user).exists())
+        Period.objects.create(first_day = '2024-09-02', user=self.user)
+        prediction = Prediction.objects.get(user=self.user)
+        self.assertEqual(prediction.computed_for, date(2024, 10, 8))
+        self.assertEqual(prediction.next_period, date(2024, 10, 3))
+        period = Period.objects.create(first_day = '2024-10-01', user=self.user)
+        prediction.refresh_from_db()
+        self.assertEqual(prediction.next_period, date(2024, 10, 31))
+        period.delete()
+        prediction.refresh_from_db()
+        self.assertEqual(prediction.next_period, date(2024, 10, 3))
+
+    def test_duplicate_first_day(self):
+        data = {'first_day': date(2024, 8, 2)}
+        url = reverse('period-list')
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Period.objects.count(), 2)
+        self.assertFalse(Prediction.objects.filter(user=self.user).exists())
+        url = reverse('statistic')
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_statistic_serves_stored_prediction(self):
+        Period.objects.create(first_day = '2024-08-02', user=self.user)
+        Period.objects.create(first_day = '2024-09-02', user=self.user)
+        Prediction.objects.filter(user=self.user).update(day=99)
+        url = reverse('statistic')
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['predictions']['day'], 99)
+
+    def test_statistic_recomputes_after_midnight(self):
+        Period.objects.create(first_day = '2024-08-02', user=self.user)
+        Period.objects.create(first_day = '2024-09-02', user=self.user)
+        url = reverse('statistic')
+        with freeze_time("2024-10-09"):
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['predictions']['day'], 38)
+        self.assertEqual(Prediction.objects.get(user=self.user).computed_for, date(2024, 10, 9))
+
+    def test_refresh_predictions_command(self):
+        Period.objects.create(first_day = '2024-08-02', user=self.user)
+        Period.objects.create(first_day = '2024-09-02', user=self.user)
+        Period.objects.create(first_day = '2024-08-10', user=self.otheruser)
+        Period.objects.create(first_day = '2024-09-12', user=self.otheruser)
+        out = StringIO()
+        with freeze_time("2024-10-09"):
+            call_command('refresh_predictions', processes=1, chunk_size=1, stdout=out)
+            self.assertIn('Refreshed predictions for 2 users.', out.getvalue())
+            self.assertEqual(Prediction.objects.filter(computed_for=date(2024, 10, 9)).count(), 2)
+            call_command('refresh_predictions', processes=1, stdout=out)
+            self.assertIn('Refreshed predictions for 0 users.', out.getvalue())
+
+
+    def test_refresh_predictions_invalid_options(self):
+        with self.assertRaisesMessage(CommandError, '--chunk-size must be at least 1.'):
+            call_command('refresh_predictions', chunk_size=0)
+        with self.assertRaisesMessage(CommandError, '--processes must be at least 1.'):
+            call_command('refresh_predictions', processes=-1)
+
+    def test_refresh_predictions_keeps_fresher_row(self):
+        Period.objects.create(first_day = '2024-08-02', user=self.user)
+        Period.objects.create(first_day = '2024-09-02', user=self.user)
+        calculate_chunk = predictions.calculate_chunk
+
+        def calculate_then_write(user_ids, today):
+            result = calculate_chunk(user_ids, today)
+            Period.objects.create(first_day = '2024-10-01', user=self.user)
+            return result
+
+        with freeze_time("2024-10-09"), mock.patch('tracker.predictions.calculate_chunk', calculate_then_write):
+            call_command('refresh_predictions', processes=1, stdout=StringIO())
+        prediction = Prediction.objects.get(user=self.user)
+        self.assertEqual(prediction.computed_for, date(2024, 10, 9))
+        self.assertEqual(prediction.next_period, date(2024, 10, 31))
+
+@freeze_time("2024-10-08")
+class RefreshPredictionsPoolTestCase(TransactionTestCase):
+    def test_refresh_predictions_command_pool(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Forked workers cannot see an in-memory SQLite test database.')
+        for i in range(3):
+            user = User.objects.create_user(username=f'user{i}', password='password')
+            Period.objects.create(first_day = '2024-08-02', user=user)
+            Period.objects.create(first_day = '2024-09-02', user=user)
+        out = StringIO()
+        with freeze_time("2024-10-09"):
+            call_command('refresh_predictions', processes=2, chunk_size=2, stdout=out)
+        self.assertIn('Refreshed predictions for 3 users.', out.getvalue())
+        self.assertEqual(Prediction.objects.filter(computed_for=date(2024, 10, 9), day=38).count(), 3)